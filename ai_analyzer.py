@@ -3,58 +3,238 @@ AI Quiz Result Analyzer
 Analyzes student quiz performance and provides personalized recommendations
 """
 
-import json
+from bisect import bisect_right
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Dict, List, Any
-from collections import defaultdict
+from functools import lru_cache
+from operator import attrgetter
+from secrets import token_hex
+from types import MappingProxyType
+from typing import Dict, Final, Iterator, List, Any, Mapping, NamedTuple, Sequence, Tuple, Union
+
+import orjson
+
+
+# Syllabus topics per subject
+SUBJECT_TOPICS: Final[Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    'biology': (
+        'Reproduction in Organisms',
+        'Sexual Reproduction in Flowering Plants',
+        'Principles of Inheritance & Variation',
+        'Molecular Basis of Inheritance',
+        'Evolution',
+        'Human Physiology',
+        'Biotechnology & Applications',
+        'Ecology'
+    ),
+    'chemistry': (
+        'Solid State',
+        'Solutions',
+        'Electrochemistry',
+        'Chemical Kinetics',
+        'Coordination Compounds',
+        'Alcohols, Phenols & Ethers',
+        'Aldehydes & Ketones',
+        'Carboxylic Acids',
+        'Amines',
+        'Biomolecules',
+        'Polymers'
+    ),
+    'physics': (
+        'Electric Charges & Fields',
+        'Electrostatic Potential & Capacitance',
+        'Current Electricity',
+        'Moving Charges & Magnetism',
+        'Magnetism & Matter',
+        'Electromagnetic Induction',
+        'Alternating Current',
+        'Electromagnetic Waves',
+        'Ray Optics',
+        'Wave Optics',
+        'Dual Nature of Radiation & Matter',
+        'Atoms & Nuclei',
+        'Semiconductor Electronics'
+    )
+})
+
+# Accuracy bands: bisect_right(thresholds, accuracy) indexes the parallel tuples
+_GRADE_THRESHOLDS = (50, 70, 85)
+_LEVELS = ("Needs Improvement", "Average", "Good", "Excellent")
+_LEVEL_MESSAGES = (
+    "Don't worry! With focused study, you can significantly improve.",
+    "You're making progress. Consistent practice will improve your scores.",
+    "Good work! Focus on weak areas to reach excellence.",
+    "Outstanding performance! You have a strong grasp of the material."
+)
+_STATUSES = ("Critical", "Weak", "Moderate", "Strong")
+
+_PRIORITY_THRESHOLDS = (50, 70)
+_PRIORITIES = ('High', 'Medium', 'Low')
+_TIME_PERCENTS = (0.40, 0.35, 0.25)  # More time for weaker subjects
+
+_SEVERITY_THRESHOLDS = (50,)
+_SEVERITIES = ('Critical', 'Moderate')
+
+_FOCUS_THRESHOLDS = (60, 75)
+_FOCUS_LEVELS = ('High', 'Medium', 'Maintenance')
+
+_TARGET_THRESHOLDS = (60, 80)
+_TARGETS = (70, 85, 90)
+
+_ACTION_THRESHOLDS = (40, 60)
+_ACTION_TEMPLATES = (
+    "Start with fundamentals. Review basic concepts in {subject} before attempting practice questions.",
+    "Focus on understanding core concepts. Practice more {subject} questions and review mistakes.",
+    "You're close! Practice advanced {subject} problems and review common error patterns."
+)
+
+# Pre-rendered labels and action plans for the known subjects
+_CAP = {subject: subject.capitalize() for subject in SUBJECT_TOPICS}
+_ACTION_PLANS = {
+    (subject, band): template.format(subject=subject)
+    for subject in SUBJECT_TOPICS
+    for band, template in enumerate(_ACTION_TEMPLATES)
+}
+
+
+class InvalidQuizData(ValueError):
+    """Raised when a quiz payload does not have the expected shape"""
+
+
+def _require_object(value: Any, where: str) -> Dict[str, Any]:
+    """Check that a payload section is a JSON object"""
+    if not isinstance(value, dict):
+        raise InvalidQuizData(f"{where} must be an object")
+    return value
+
+
+def _read_counts(section: Any, where: str) -> Tuple[int, int, int]:
+    """Validate and read (correct, total, answered) from a payload section"""
+    section = _require_object(section, where)
+    counts = []
+    
+    for key in ('correct', 'total', 'answered'):
+        value = section.get(key, 0)
+        # bool is an int subclass, so compare the exact type
+        if type(value) is not int or value < 0:
+            raise InvalidQuizData(f"{where}.{key} must be a non-negative integer")
+        counts.append(value)
+    
+    return tuple(counts)
+
+
+class OverallStat(NamedTuple):
+    """Overall question counts from the quiz payload"""
+    correct: int
+    total: int
+    answered: int
+
+
+class SubjectStat(NamedTuple):
+    """Per-subject counts and accuracy, computed once per analysis"""
+    name: str
+    label: str
+    accuracy: float
+    rounded_accuracy: float
+    accuracy_text: str  # Whole-percent accuracy for messages, e.g. "63"
+    correct: int
+    total: int
+    answered: int
+    wrong: int
+
+
+@dataclass(frozen=True, slots=True)
+class OverallPerformance:
+    """Overall quiz performance"""
+    accuracy: float
+    completion_rate: float
+    total_questions: int
+    correct_answers: int
+    incorrect_answers: int
+    unanswered: int
+    performance_level: str
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectAnalysis:
+    """Performance summary for a single subject"""
+    accuracy: float
+    correct: int
+    total: int
+    wrong: int
+    status: str
+    improvement_needed: bool
+    priority: str
+
+
+@dataclass(frozen=True, slots=True)
+class Weakness:
+    """Subject that needs improvement"""
+    subject: str
+    accuracy: float
+    questions_wrong: int
+    severity: str
+    action: str
+
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    """Personalized study recommendation"""
+    priority: str
+    subject: str
+    title: str
+    description: str
+    action_items: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectAllocation:
+    """Daily time allocation for a subject"""
+    time_minutes: int
+    focus_level: str
+
+
+@dataclass(frozen=True, slots=True)
+class StudyPlan:
+    """Personalized study plan"""
+    daily_schedule: Dict[str, SubjectAllocation]
+    weekly_goals: Tuple[str, ...]
+    study_duration: str
+
+
+@dataclass(frozen=True, slots=True)
+class StudentScore:
+    """Overall score for one student in a batch"""
+    student_id: str
+    accuracy: float
+    performance_level: str
+
+
+@dataclass(frozen=True, slots=True)
+class Analysis:
+    """Complete analysis of a quiz attempt"""
+    student_id: str
+    analysis_id: str
+    timestamp: str
+    overall_performance: OverallPerformance
+    subject_analysis: Dict[str, SubjectAnalysis]
+    recommendations: Tuple[Recommendation, ...]
+    study_plan: StudyPlan
+    strengths: Tuple[str, ...]
+    weaknesses: Tuple[Weakness, ...]
+
+
+_STUDY_DURATION = '2-3 hours daily'
+_NO_STRENGTHS = "Keep practicing to identify your strong subjects"
 
 
 class QuizAnalyzer:
     """Analyzes quiz results and generates recommendations"""
     
-    def __init__(self):
-        self.subject_topics = {
-            'biology': [
-                'Reproduction in Organisms',
-                'Sexual Reproduction in Flowering Plants',
-                'Principles of Inheritance & Variation',
-                'Molecular Basis of Inheritance',
-                'Evolution',
-                'Human Physiology',
-                'Biotechnology & Applications',
-                'Ecology'
-            ],
-            'chemistry': [
-                'Solid State',
-                'Solutions',
-                'Electrochemistry',
-                'Chemical Kinetics',
-                'Coordination Compounds',
-                'Alcohols, Phenols & Ethers',
-                'Aldehydes & Ketones',
-                'Carboxylic Acids',
-                'Amines',
-                'Biomolecules',
-                'Polymers'
-            ],
-            'physics': [
-                'Electric Charges & Fields',
-                'Electrostatic Potential & Capacitance',
-                'Current Electricity',
-                'Moving Charges & Magnetism',
-                'Magnetism & Matter',
-                'Electromagnetic Induction',
-                'Alternating Current',
-                'Electromagnetic Waves',
-                'Ray Optics',
-                'Wave Optics',
-                'Dual Nature of Radiation & Matter',
-                'Atoms & Nuclei',
-                'Semiconductor Electronics'
-            ]
-        }
+    __slots__ = ()
     
-    def analyze_results(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_results(self, quiz_data: Dict[str, Any]) -> Analysis:
         """
         Main analysis function
         
@@ -62,293 +242,327 @@ class QuizAnalyzer:
             quiz_data: Quiz results from localStorage
             
         Returns:
-            Complete analysis with recommendations
+            Complete analysis with recommendations. The records are frozen and
+            shared with the analysis cache; the subject_analysis and
+            daily_schedule dicts are fresh copies for each call.
+            
+        Raises:
+            InvalidQuizData: If the payload is malformed
         """
-        analysis = {
-            'student_id': quiz_data.get('student_id', 'anonymous'),
-            'analysis_id': f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            'timestamp': datetime.now().isoformat(),
-            'overall_performance': self._analyze_overall(quiz_data),
-            'subject_analysis': self._analyze_subjects(quiz_data),
-            'recommendations': self._generate_recommendations(quiz_data),
-            'study_plan': self._create_study_plan(quiz_data),
-            'strengths': self._identify_strengths(quiz_data),
-            'weaknesses': self._identify_weaknesses(quiz_data)
-        }
+        analysis = self._analyze_cached(
+            self._overall_stats(quiz_data),
+            self._subject_stats(quiz_data)
+        )
+        now = datetime.now()
         
-        return analysis
+        return replace(
+            analysis,
+            student_id=quiz_data.get('student_id', 'anonymous'),
+            # Random suffix keeps IDs unique for analyses within the same second
+            analysis_id=f"analysis_{now:%Y%m%d_%H%M%S}_{token_hex(4)}",
+            timestamp=now.isoformat(),
+            # Dicts are the only mutable containers in the cached record
+            subject_analysis=dict(analysis.subject_analysis),
+            study_plan=replace(
+                analysis.study_plan,
+                daily_schedule=dict(analysis.study_plan.daily_schedule)
+            )
+        )
     
-    def _analyze_overall(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+    @lru_cache(maxsize=1024)
+    def _analyze_cached(self, overall: OverallStat,
+                        subject_stats: Tuple[SubjectStat, ...]) -> Analysis:
+        """
+        Analysis for a given set of counts, memoized on those counts
+        
+        The result is shared by every request with the same counts. Its records
+        are frozen and its sequences are tuples; analyze_results copies the
+        two dicts before handing the result out.
+        """
+        if not subject_stats:
+            # Partial submission: only the overall figures depend on the input
+            return Analysis(
+                student_id='',
+                analysis_id='',
+                timestamp='',
+                overall_performance=self._analyze_overall(overall),
+                subject_analysis={},
+                recommendations=tuple(self._iter_recommendations(overall, subject_stats)),
+                study_plan=StudyPlan(
+                    daily_schedule={},
+                    weekly_goals=(),
+                    study_duration=_STUDY_DURATION
+                ),
+                strengths=(_NO_STRENGTHS,),
+                weaknesses=()
+            )
+        
+        return Analysis(
+            student_id='',
+            analysis_id='',
+            timestamp='',
+            overall_performance=self._analyze_overall(overall),
+            subject_analysis=self._analyze_subjects(subject_stats),
+            recommendations=tuple(self._iter_recommendations(overall, subject_stats)),
+            study_plan=self._create_study_plan(subject_stats),
+            strengths=tuple(self._iter_strengths(subject_stats)),
+            weaknesses=tuple(self._iter_weaknesses(subject_stats))
+        )
+    
+    def score_batch(self, quiz_batch: List[Dict[str, Any]]) -> List[StudentScore]:
+        """
+        Score overall performance for many students at once
+        
+        Args:
+            quiz_batch: List of quiz results, one per student
+            
+        Returns:
+            Overall accuracy and performance level for each student
+        """
+        scores = []
+        
+        for quiz_data in quiz_batch:
+            correct, total, _ = self._overall_stats(quiz_data)
+            accuracy = (correct / total * 100) if total > 0 else 0
+            level, _ = self._get_performance_level(accuracy)
+            scores.append(StudentScore(
+                student_id=quiz_data.get('student_id', 'anonymous'),
+                accuracy=round(accuracy, 2),
+                performance_level=level
+            ))
+        
+        return scores
+    
+    def _overall_stats(self, quiz_data: Dict[str, Any]) -> OverallStat:
+        """Validate and read the overall counts from the quiz payload"""
+        overall = _require_object(quiz_data, 'quiz data').get('overall', {})
+        return OverallStat(*_read_counts(overall, 'overall'))
+    
+    def _subject_stats(self, quiz_data: Dict[str, Any]) -> Tuple[SubjectStat, ...]:
+        """Validate the subjects and compute their accuracy in a single pass"""
+        subjects = _require_object(quiz_data, 'quiz data').get('subjects', {})
+        subject_stats = []
+        
+        for subject, stats in _require_object(subjects, 'subjects').items():
+            correct, total, answered = _read_counts(stats, f"subjects.{subject}")
+            accuracy = (correct / total * 100) if total > 0 else 0
+            subject_stats.append(SubjectStat(
+                subject, _CAP.get(subject) or subject.capitalize(),
+                accuracy, round(accuracy, 2), f"{accuracy:.0f}",
+                correct, total, answered, total - correct
+            ))
+        
+        return tuple(subject_stats)
+    
+    def _analyze_overall(self, overall: OverallStat) -> OverallPerformance:
         """Analyze overall performance"""
-        overall = quiz_data.get('overall', {})
-        total = overall.get('total', 0)
-        correct = overall.get('correct', 0)
-        answered = overall.get('answered', 0)
+        correct, total, answered = overall
         
         accuracy = (correct / total * 100) if total > 0 else 0
         completion_rate = (answered / total * 100) if total > 0 else 0
+        level, message = self._get_performance_level(accuracy)
         
-        # Determine performance level
-        if accuracy >= 85:
-            level = "Excellent"
-            message = "Outstanding performance! You have a strong grasp of the material."
-        elif accuracy >= 70:
-            level = "Good"
-            message = "Good work! Focus on weak areas to reach excellence."
-        elif accuracy >= 50:
-            level = "Average"
-            message = "You're making progress. Consistent practice will improve your scores."
-        else:
-            level = "Needs Improvement"
-            message = "Don't worry! With focused study, you can significantly improve."
-        
-        return {
-            'accuracy': round(accuracy, 2),
-            'completion_rate': round(completion_rate, 2),
-            'total_questions': total,
-            'correct_answers': correct,
-            'incorrect_answers': answered - correct,
-            'unanswered': total - answered,
-            'performance_level': level,
-            'message': message
-        }
+        return OverallPerformance(
+            accuracy=round(accuracy, 2),
+            completion_rate=round(completion_rate, 2),
+            total_questions=total,
+            correct_answers=correct,
+            incorrect_answers=answered - correct,
+            unanswered=total - answered,
+            performance_level=level,
+            message=message
+        )
+    
+    def _get_performance_level(self, accuracy: float) -> Tuple[str, str]:
+        """Get performance level and message based on overall accuracy"""
+        band = bisect_right(_GRADE_THRESHOLDS, accuracy)
+        return _LEVELS[band], _LEVEL_MESSAGES[band]
     
-    def _analyze_subjects(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_subjects(self, subject_stats: Sequence[SubjectStat]) -> Dict[str, SubjectAnalysis]:
         """Analyze performance by subject"""
-        subjects = quiz_data.get('subjects', {})
         subject_analysis = {}
         
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            answered = stats.get('answered', 0)
-            
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            # Identify weak areas
-            weak_areas = []
+        for stat in subject_stats:
+            accuracy = stat.accuracy
             improvement_needed = accuracy < 70
             
-            subject_analysis[subject] = {
-                'accuracy': round(accuracy, 2),
-                'correct': correct,
-                'total': total,
-                'wrong': total - correct,
-                'status': self._get_status(accuracy),
-                'improvement_needed': improvement_needed,
-                'priority': 'High' if accuracy < 50 else 'Medium' if accuracy < 70 else 'Low'
-            }
+            subject_analysis[stat.name] = SubjectAnalysis(
+                accuracy=stat.rounded_accuracy,
+                correct=stat.correct,
+                total=stat.total,
+                wrong=stat.wrong,
+                status=self._get_status(accuracy),
+                improvement_needed=improvement_needed,
+                priority=_PRIORITIES[bisect_right(_PRIORITY_THRESHOLDS, accuracy)]
+            )
         
         return subject_analysis
     
     def _get_status(self, accuracy: float) -> str:
         """Get status based on accuracy"""
-        if accuracy >= 85:
-            return "Strong"
-        elif accuracy >= 70:
-            return "Moderate"
-        elif accuracy >= 50:
-            return "Weak"
-        else:
-            return "Critical"
+        return _STATUSES[bisect_right(_GRADE_THRESHOLDS, accuracy)]
     
-    def _identify_strengths(self, quiz_data: Dict[str, Any]) -> List[str]:
-        """Identify student's strengths"""
-        subjects = quiz_data.get('subjects', {})
-        strengths = []
-        
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            if accuracy >= 75:
-                strengths.append(f"{subject.capitalize()}: {accuracy:.0f}% accuracy - Excellent understanding")
+    def _iter_strengths(self, subject_stats: Sequence[SubjectStat]) -> Iterator[str]:
+        """Yield student's strengths"""
+        found = False
         
-        if not strengths:
-            strengths.append("Keep practicing to identify your strong subjects")
+        for stat in subject_stats:
+            if stat.accuracy >= 75:
+                found = True
+                yield f"{stat.label}: {stat.accuracy_text}% accuracy - Excellent understanding"
         
-        return strengths
+        if not found:
+            yield _NO_STRENGTHS
     
-    def _identify_weaknesses(self, quiz_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Identify areas needing improvement"""
-        subjects = quiz_data.get('subjects', {})
-        weaknesses = []
+    def _iter_weaknesses(self, subject_stats: Sequence[SubjectStat]) -> Iterator[Weakness]:
+        """Yield areas needing improvement, lowest accuracy first"""
+        weak = sorted(
+            (stat for stat in subject_stats if stat.accuracy < 70),
+            key=attrgetter('accuracy')
+        )
         
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            wrong = total - correct
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            if accuracy < 70:
-                weaknesses.append({
-                    'subject': subject.capitalize(),
-                    'accuracy': round(accuracy, 2),
-                    'questions_wrong': wrong,
-                    'severity': 'Critical' if accuracy < 50 else 'Moderate',
-                    'action': self._get_action_plan(subject, accuracy)
-                })
-        
-        # Sort by severity (lowest accuracy first)
-        weaknesses.sort(key=lambda x: x['accuracy'])
-        
-        return weaknesses
+        for stat in weak:
+            accuracy = stat.accuracy
+            yield Weakness(
+                subject=stat.label,
+                accuracy=stat.rounded_accuracy,
+                questions_wrong=stat.wrong,
+                severity=_SEVERITIES[bisect_right(_SEVERITY_THRESHOLDS, accuracy)],
+                action=self._get_action_plan(stat.name, accuracy)
+            )
     
     def _get_action_plan(self, subject: str, accuracy: float) -> str:
         """Generate specific action plan"""
-        if accuracy < 40:
-            return f"Start with fundamentals. Review basic concepts in {subject} before attempting practice questions."
-        elif accuracy < 60:
-            return f"Focus on understanding core concepts. Practice more {subject} questions and review mistakes."
-        else:
-            return f"You're close! Practice advanced {subject} problems and review common error patterns."
+        band = bisect_right(_ACTION_THRESHOLDS, accuracy)
+        action = _ACTION_PLANS.get((subject, band))
+        if action is None:
+            action = _ACTION_TEMPLATES[band].format(subject=subject)
+        return action
     
-    def _generate_recommendations(self, quiz_data: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Generate personalized recommendations"""
-        subjects = quiz_data.get('subjects', {})
-        recommendations = []
-        
-        # Sort subjects by accuracy
-        subject_scores = []
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            accuracy = (correct / total * 100) if total > 0 else 0
-            subject_scores.append((subject, accuracy, stats))
-        
-        subject_scores.sort(key=lambda x: x[1])
-        
+    def _iter_recommendations(self, overall: OverallStat,
+                              subject_stats: Sequence[SubjectStat]) -> Iterator[Recommendation]:
+        """Yield personalized recommendations, most urgent first"""
         # Recommendation 1: Weakest subject
-        if subject_scores:
-            weakest_subject, weakest_score, weakest_stats = subject_scores[0]
-            if weakest_score < 70:
-                recommendations.append({
-                    'priority': 'High',
-                    'subject': weakest_subject.capitalize(),
-                    'title': f'Focus on {weakest_subject.capitalize()}',
-                    'description': f'Your {weakest_subject} score is {weakest_score:.0f}%. This needs immediate attention. '
-                                 f'Dedicate at least 1-2 hours daily to strengthen this subject.',
-                    'action_items': [
-                        f'Review fundamental {weakest_subject} concepts',
+        if subject_stats:
+            weakest = min(subject_stats, key=attrgetter('accuracy'))
+            if weakest.accuracy < 70:
+                yield Recommendation(
+                    priority='High',
+                    subject=weakest.label,
+                    title=f'Focus on {weakest.label}',
+                    description=f'Your {weakest.name} score is {weakest.accuracy_text}%. This needs immediate attention. '
+                                f'Dedicate at least 1-2 hours daily to strengthen this subject.',
+                    action_items=(
+                        f'Review fundamental {weakest.name} concepts',
                         'Practice 10-15 questions daily',
                         'Watch tutorial videos on weak topics',
                         'Make summary notes of key concepts'
-                    ]
-                })
+                    )
+                )
         
         # Recommendation 2: Practice consistency
-        overall = quiz_data.get('overall', {})
-        answered = overall.get('answered', 0)
-        total = overall.get('total', 0)
+        answered = overall.answered
+        total = overall.total
         
         if answered < total:
             unanswered = total - answered
-            recommendations.append({
-                'priority': 'Medium',
-                'subject': 'All Subjects',
-                'title': 'Complete All Questions',
-                'description': f'You left {unanswered} questions unanswered. Always attempt all questions to maximize learning.',
-                'action_items': [
+            yield Recommendation(
+                priority='Medium',
+                subject='All Subjects',
+                title='Complete All Questions',
+                description=f'You left {unanswered} questions unanswered. Always attempt all questions to maximize learning.',
+                action_items=(
                     'Practice time management',
                     'Attempt educated guesses for uncertain answers',
                     'Review questions you skipped'
-                ]
-            })
+                )
+            )
         
         # Recommendation 3: Maintain strengths
-        if len(subject_scores) > 0:
-            strongest_subject, strongest_score, _ = subject_scores[-1]
-            if strongest_score >= 75:
-                recommendations.append({
-                    'priority': 'Low',
-                    'subject': strongest_subject.capitalize(),
-                    'title': f'Maintain Your {strongest_subject.capitalize()} Strength',
-                    'description': f'You scored {strongest_score:.0f}% in {strongest_subject}! Keep practicing to maintain this level.',
-                    'action_items': [
-                        f'Solve advanced {strongest_subject} problems',
+        if subject_stats:
+            # Last of any equally strong subjects, as the previous sort-based pick did
+            strongest = max(reversed(subject_stats), key=attrgetter('accuracy'))
+            if strongest.accuracy >= 75:
+                yield Recommendation(
+                    priority='Low',
+                    subject=strongest.label,
+                    title=f'Maintain Your {strongest.label} Strength',
+                    description=f'You scored {strongest.accuracy_text}% in {strongest.name}! Keep practicing to maintain this level.',
+                    action_items=(
+                        f'Solve advanced {strongest.name} problems',
                         'Help peers who struggle with this subject',
                         'Take mock tests to stay sharp'
-                    ]
-                })
-        
-        return recommendations
+                    )
+                )
     
-    def _create_study_plan(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_study_plan(self, subject_stats: Sequence[SubjectStat]) -> StudyPlan:
         """Create a personalized study plan"""
-        subjects = quiz_data.get('subjects', {})
-        
         # Calculate time allocation based on performance
-        plan = {
-            'daily_schedule': {},
-            'weekly_goals': [],
-            'study_duration': '2-3 hours daily'
-        }
-        
         total_time = 180  # minutes per day
         subject_allocation = {}
         
         # Allocate more time to weaker subjects
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            # More time for weaker subjects
-            if accuracy < 50:
-                time_percent = 0.40
-            elif accuracy < 70:
-                time_percent = 0.35
-            else:
-                time_percent = 0.25
+        for stat in subject_stats:
+            accuracy = stat.accuracy
+            time_percent = _TIME_PERCENTS[bisect_right(_PRIORITY_THRESHOLDS, accuracy)]
             
-            subject_allocation[subject] = {
-                'time_minutes': int(total_time * time_percent / len(subjects)),
-                'focus_level': 'High' if accuracy < 60 else 'Medium' if accuracy < 75 else 'Maintenance'
-            }
-        
-        plan['daily_schedule'] = subject_allocation
+            subject_allocation[stat.name] = SubjectAllocation(
+                time_minutes=int(total_time * time_percent / len(subject_stats)),
+                focus_level=_FOCUS_LEVELS[bisect_right(_FOCUS_THRESHOLDS, accuracy)]
+            )
         
         # Weekly goals
-        for subject, stats in subjects.items():
-            total = stats.get('total', 0)
-            correct = stats.get('correct', 0)
-            accuracy = (correct / total * 100) if total > 0 else 0
-            
-            if accuracy < 60:
-                target = 70
-            elif accuracy < 80:
-                target = 85
-            else:
-                target = 90
-            
-            plan['weekly_goals'].append(
-                f"Improve {subject.capitalize()} from {accuracy:.0f}% to {target}%"
+        weekly_goals = []
+        for stat in subject_stats:
+            target = _TARGETS[bisect_right(_TARGET_THRESHOLDS, stat.accuracy)]
+            weekly_goals.append(
+                f"Improve {stat.label} from {stat.accuracy_text}% to {target}%"
             )
         
-        return plan
+        return StudyPlan(
+            daily_schedule=subject_allocation,
+            weekly_goals=tuple(weekly_goals),
+            study_duration=_STUDY_DURATION
+        )
+
+
+_ANALYZER = QuizAnalyzer()
+
+
+def analyze_quiz_data(quiz_data: Dict[str, Any]) -> Analysis:
+    """
+    Analyze one parsed quiz payload with the shared analyzer
+    
+    Module-level so it can be sent to worker processes.
+    
+    Args:
+        quiz_data: Quiz results, as for QuizAnalyzer.analyze_results
+        
+    Returns:
+        Complete analysis with recommendations
+    """
+    return _ANALYZER.analyze_results(quiz_data)
 
 
-def analyze_quiz_results(quiz_data_json: str) -> str:
+def analyze_quiz_results(quiz_data_json: Union[str, bytes]) -> str:
     """
     Main function to analyze quiz results
     
     Args:
-        quiz_data_json: JSON string of quiz results
+        quiz_data_json: JSON string (or UTF-8 bytes) of quiz results
         
     Returns:
         JSON string of analysis results
     """
     try:
-        quiz_data = json.loads(quiz_data_json)
-        analyzer = QuizAnalyzer()
-        analysis = analyzer.analyze_results(quiz_data)
-        return json.dumps(analysis, indent=2)
+        quiz_data = orjson.loads(quiz_data_json)
+        analysis = _ANALYZER.analyze_results(quiz_data)
+        return orjson.dumps(analysis).decode()
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             'error': str(e),
             'status': 'failed'
-        })
+        }).decode()
 
 
 if __name__ == '__main__':
@@ -367,5 +581,5 @@ if __name__ == '__main__':
         }
     }
     
-    result = analyze_quiz_results(json.dumps(sample_data))
+    result = analyze_quiz_results(orjson.dumps(sample_data))
     print(result)
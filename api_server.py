@@ -4,15 +4,112 @@ Provides endpoints for analyzing quiz results and generating recommendations
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import json
-from ai_analyzer import QuizAnalyzer
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+import multiprocessing
+import os
+import threading
+import orjson
+from ai_analyzer import QuizAnalyzer, InvalidQuizData, analyze_quiz_data
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Compact JSON provider backed by orjson (serializes dataclasses natively)
+    
+    Keys are not sorted: dataclass records keep their field order and dicts
+    keep insertion order.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend access
 
 analyzer = QuizAnalyzer()
 
+# Worker processes for cohort analysis, started on first use so that
+# pre-forking servers (gunicorn preload_app) don't inherit a broken pool.
+# The pool is created from a request thread, and forking a multi-threaded
+# process can deadlock the child, so start workers via forkserver (or spawn
+# where forkserver is unavailable, e.g. Windows).
+_COHORT_START_METHOD = (
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+def _read_cohort_pool_size() -> int:
+    """Cohort worker processes per server process (COHORT_POOL_WORKERS, default: one per core)"""
+    configured = os.environ.get('COHORT_POOL_WORKERS')
+    if not configured:
+        return os.cpu_count() or 1
+    
+    try:
+        size = int(configured)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise RuntimeError(
+            f"COHORT_POOL_WORKERS must be a positive integer, got {configured!r}"
+        )
+    return size
+
+
+# Validated at import so a bad setting stops the server at startup
+_COHORT_POOL_SIZE = _read_cohort_pool_size()
+_cohort_pool = None
+_cohort_pool_lock = threading.Lock()
+
+
+def _get_cohort_pool() -> ProcessPoolExecutor:
+    """Return the cohort process pool, creating it if needed"""
+    global _cohort_pool
+    
+    with _cohort_pool_lock:
+        if _cohort_pool is None:
+            _cohort_pool = ProcessPoolExecutor(
+                max_workers=_COHORT_POOL_SIZE,
+                mp_context=multiprocessing.get_context(_COHORT_START_METHOD)
+            )
+        return _cohort_pool
+
+
+def _discard_cohort_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken cohort pool so the next call starts a fresh one"""
+    global _cohort_pool
+    
+    with _cohort_pool_lock:
+        # Another thread may already have replaced it
+        if _cohort_pool is pool:
+            _cohort_pool = None
+    pool.shutdown(wait=False)
+
+
+def _map_cohort(quiz_batch: list) -> list:
+    """Analyze a cohort in the pool, retrying once on a fresh pool if it broke"""
+    if _COHORT_POOL_SIZE <= 1:
+        # A single pool process adds pickling/IPC cost without any parallelism
+        return [analyze_quiz_data(quiz_data) for quiz_data in quiz_batch]
+    
+    for attempt in range(2):
+        pool = _get_cohort_pool()
+        try:
+            return list(pool.map(analyze_quiz_data, quiz_batch, chunksize=8))
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash); the pool is unusable from now on
+            _discard_cohort_pool(pool)
+            if attempt:
+                raise
+
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_results():
@@ -46,6 +143,104 @@ def analyze_results():
             'data': analysis
         }), 200
         
+    except InvalidQuizData as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 500
+
+
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """
+    Score overall performance for a batch of students (e.g. class dashboard)
+    
+    Expected JSON body:
+    [
+        {"student_id": "...", "overall": {...}, ...},
+        ...
+    ]
+    
+    Returns:
+    Overall accuracy and performance level per student
+    """
+    try:
+        quiz_batch = request.json
+        
+        if not isinstance(quiz_batch, list):
+            return jsonify({
+                'error': 'Expected a list of quiz results',
+                'status': 'failed'
+            }), 400
+        
+        scores = analyzer.score_batch(quiz_batch)
+        
+        return jsonify({
+            'status': 'success',
+            'scores': scores
+        }), 200
+        
+    except InvalidQuizData as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 500
+
+
+@app.route('/api/analyze-cohort', methods=['POST'])
+def analyze_cohort():
+    """
+    Full analysis for every student in a cohort, spread across CPU cores
+    
+    Expected JSON body:
+    [
+        {"student_id": "...", "overall": {...}, "subjects": {...}},
+        ...
+    ]
+    
+    Returns:
+    One complete analysis per student, in request order
+    """
+    try:
+        quiz_batch = request.json
+        
+        if not isinstance(quiz_batch, list):
+            return jsonify({
+                'error': 'Expected a list of quiz results',
+                'status': 'failed'
+            }), 400
+        
+        analyses = _map_cohort(quiz_batch)
+        
+        return jsonify({
+            'status': 'success',
+            'analyses': analyses
+        }), 200
+        
+    except InvalidQuizData as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 400
+        
+    except BrokenProcessPool:
+        return jsonify({
+            'error': 'Cohort analysis workers are unavailable, please retry',
+            'status': 'failed'
+        }), 503
+        
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -67,16 +262,38 @@ def health_check():
 def get_recommendations():
     """
     Get only recommendations without full analysis
+    
+    Query parameters:
+        limit: Return at most this many recommendations (most urgent first)
     """
     try:
         quiz_data = request.json
-        recommendations = analyzer._generate_recommendations(quiz_data)
+        limit = request.args.get('limit', type=int)
+        
+        if limit is not None and limit < 0:
+            return jsonify({
+                'error': 'limit must be a non-negative integer',
+                'status': 'failed'
+            }), 400
+        
+        recommendations = list(islice(
+            analyzer._iter_recommendations(
+                analyzer._overall_stats(quiz_data), analyzer._subject_stats(quiz_data)
+            ),
+            limit
+        ))
         
         return jsonify({
             'status': 'success',
             'recommendations': recommendations
         }), 200
         
+    except InvalidQuizData as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 400
+        
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -91,13 +308,19 @@ def get_study_plan():
     """
     try:
         quiz_data = request.json
-        study_plan = analyzer._create_study_plan(quiz_data)
+        study_plan = analyzer._create_study_plan(analyzer._subject_stats(quiz_data))
         
         return jsonify({
             'status': 'success',
             'study_plan': study_plan
         }), 200
         
+    except InvalidQuizData as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'failed'
+        }), 400
+        
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -106,11 +329,15 @@ def get_study_plan():
 
 
 if __name__ == '__main__':
-    print("🚀 Starting AI Quiz Analyzer API Server...")
-    print("📊 Server running at: http://localhost:5000")
-    print("🔗 API Endpoints:")
+    from waitress import serve
+    
+    print("Starting AI Quiz Analyzer API Server...")
+    print("Server running at: http://localhost:5000")
+    print("API Endpoints:")
     print("   - POST /api/analyze - Full analysis")
+    print("   - POST /api/analyze-batch - Score a batch of students")
+    print("   - POST /api/analyze-cohort - Full analysis for a cohort")
     print("   - POST /api/recommendations - Get recommendations")
     print("   - POST /api/study-plan - Get study plan")
     print("   - GET  /api/health - Health check")
-    app.run(debug=True, port=5000)
+    serve(app, host='127.0.0.1', port=5000, threads=8)
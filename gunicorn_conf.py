@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the AI Quiz Analyzer API
+
+Usage (Linux/macOS):
+    gunicorn -c gunicorn_conf.py api_server:app
+"""
+
+import multiprocessing
+import os
+
+bind = '127.0.0.1:5000'
+
+# Threaded workers: one process per core (plus spare), a few threads each
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_class = 'gthread'
+threads = 4
+
+# /api/analyze-cohort would otherwise start a process pool with one process
+# per core in *every* worker: workers * cpu_count processes fighting over the
+# same cores. With this many workers the cores are already busy serving
+# requests, so analyze cohorts in-process (a pool size of 1 disables the pool).
+# For large cohorts, trade request concurrency for cohort parallelism instead:
+# run fewer workers (e.g. 2) and set COHORT_POOL_WORKERS to cpu_count // workers.
+os.environ.setdefault('COHORT_POOL_WORKERS', '1')
+
+# Import the app (and its analyzer) once in the master so workers share it
+preload_app = True